@@ -10,6 +10,20 @@ const faviconSvg = `<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100
   <circle cx="70" cy="70" r="8" fill="#fff"/>
 </svg>`;
 
+// Route patterns, compiled once at load.
+const wsRoomRoute = /^\/ws\/room\/([A-Za-z0-9-]+)$/;
+const roomPageRoute = /^\/room\/([A-Za-z0-9-]+)$/;
+
+// Fixed frames are serialized once at load instead of on every send.
+const errorFrame = (message) => JSON.stringify({ type: "error", message });
+const pongFrame = JSON.stringify({ type: "pong" });
+const errorFrames = {
+  emptyList: errorFrame("List is empty"),
+  minAboveMax: errorFrame("min cannot exceed max"),
+  noList: errorFrame("Add a list before drawing"),
+  allDrawn: errorFrame("All items already drawn"),
+};
+
 export default {
   async fetch(request, env, ctx) {
     const url = new URL(request.url);
@@ -21,9 +35,9 @@ export default {
 
     // Serve favicon
     if (url.pathname === "/favicon.svg") {
-      return new Response(faviconSvg, {
-        status: 200,
-        headers: { "content-type": "image/svg+xml" },
+      return cached(request, favicon, {
+        "content-type": "image/svg+xml",
+        "cache-control": "public, max-age=31536000, immutable",
       });
     }
 
@@ -37,23 +51,23 @@ export default {
     }
 
     // WebSocket upgrade routed to the room Durable Object
-    const wsMatch = url.pathname.match(/^\/ws\/room\/([A-Za-z0-9-]+)$/);
+    const wsMatch = wsRoomRoute.exec(url.pathname);
     if (wsMatch && request.headers.get("Upgrade") === "websocket") {
       const roomId = wsMatch[1];
-      const id = env.ROOM_DO.idFromName(roomId);
+      const id = roomObjectId(env, roomId);
       const stub = env.ROOM_DO.get(id);
       return stub.fetch(request);
     }
 
     // Room page (simple static HTML/JS)
-    const roomPageMatch = url.pathname.match(/^\/room\/([A-Za-z0-9-]+)$/);
+    const roomPageMatch = roomPageRoute.exec(url.pathname);
     if (roomPageMatch && request.method === "GET") {
-      return html(renderApp(roomPageMatch[1]));
+      return html(request, roomPage);
     }
 
     // Landing page
     if (url.pathname === "/" && request.method === "GET") {
-      return html(renderApp(""));
+      return html(request, landingPage);
     }
 
     return new Response("not found", { status: 404 });
@@ -65,9 +79,9 @@ export class RoomDurableObject {
   constructor(state, env) {
     this.state = state;
     this.env = env;
-    this.clients = new Map(); // clientId -> WebSocket
-    this.names = new Map(); // clientId -> name
-    this.lastResult = null;
+    this.clients = new Map(); // clientId -> { socket, name }
+    this.lastResultMessage = null; // serialized once, replayed to newcomers
+    this.listMessage = null;
     this.listItems = [];
     this.drawnHistory = [];
     this.withReplacement = true;
@@ -90,24 +104,16 @@ export class RoomDurableObject {
     const clientId = crypto.randomUUID();
     const defaultName = `Guest-${clientId.slice(0, 5)}`;
 
-    this.clients.set(clientId, socket);
-    this.names.set(clientId, defaultName);
+    this.clients.set(clientId, { socket, name: defaultName });
 
     // Send last result to newcomer
-    if (this.lastResult) {
-      socket.send(JSON.stringify({ type: "result", ...this.lastResult }));
+    if (this.lastResultMessage) {
+      socket.send(this.lastResultMessage);
     }
 
     // Send list state if any
-    if (this.listItems.length) {
-      socket.send(
-        JSON.stringify({
-          type: "list_state",
-          items: this.listItems,
-          drawn: this.withReplacement ? [] : this.drawnHistory,
-          withReplacement: this.withReplacement,
-        })
-      );
+    if (this.listMessage) {
+      socket.send(this.listMessage);
     }
 
     this.broadcastUsers();
@@ -133,17 +139,19 @@ export class RoomDurableObject {
       return;
     }
 
-    const socket = this.clients.get(clientId);
-    if (!socket) return;
+    const client = this.clients.get(clientId);
+    if (!client) return;
+    const { socket } = client;
 
     if (msg.type === "ping") {
-      socket.send(JSON.stringify({ type: "pong" }));
+      socket.send(pongFrame);
       return;
     }
 
     if (msg.type === "join") {
       const safeName = sanitizeName(msg.name);
-      this.names.set(clientId, safeName);
+      if (client.name === safeName) return; // users list unchanged
+      client.name = safeName;
       this.broadcastUsers();
       return;
     }
@@ -151,9 +159,7 @@ export class RoomDurableObject {
     if (msg.type === "set_list") {
       const { items, withReplacement } = sanitizeListPayload(msg);
       if (!items.length) {
-        socket.send(
-          JSON.stringify({ type: "error", message: "List is empty" })
-        );
+        socket.send(errorFrames.emptyList);
         return;
       }
       this.listItems = items;
@@ -169,107 +175,123 @@ export class RoomDurableObject {
       let result;
 
       if (mode === "coin") {
-        result = Math.random() < 0.5 ? "Heads" : "Tails";
+        result = randomUint32() & 1 ? "Heads" : "Tails";
       } else if (mode === "number") {
         const min = clampInt(msg.min ?? 1, -1_000_000, 1_000_000);
         const max = clampInt(msg.max ?? 100, -1_000_000, 1_000_000);
         if (min > max) {
-          socket.send(
-            JSON.stringify({ type: "error", message: "min cannot exceed max" })
-          );
+          socket.send(errorFrames.minAboveMax);
           return;
         }
         const span = max - min + 1;
-        result = String(min + Math.floor(Math.random() * span));
+        result = String(min + randomInt(span));
       } else {
         // list mode
         if (!this.listItems.length) {
-          socket.send(
-            JSON.stringify({
-              type: "error",
-              message: "Add a list before drawing",
-            })
-          );
+          socket.send(errorFrames.noList);
           return;
         }
         if (this.withReplacement) {
-          const idx = Math.floor(Math.random() * this.listItems.length);
+          const idx = randomInt(this.listItems.length);
           result = this.listItems[idx];
         } else {
           if (!this.remainingIndices.length) {
-            socket.send(
-              JSON.stringify({
-                type: "error",
-                message: "All items already drawn",
-              })
-            );
+            socket.send(errorFrames.allDrawn);
             return;
           }
-          const pick = Math.floor(Math.random() * this.remainingIndices.length);
-          const idx = this.remainingIndices.splice(pick, 1)[0];
+          // Order of the remaining pool is irrelevant, so swap-remove in O(1).
+          const remaining = this.remainingIndices;
+          const pick = randomInt(remaining.length);
+          const idx = remaining[pick];
+          remaining[pick] = remaining[remaining.length - 1];
+          remaining.pop();
           result = this.listItems[idx];
           this.drawnHistory.push(result);
           this.broadcastList(); // update drawn list for clients
         }
       }
 
-      const payload = {
+      this.lastResultMessage = JSON.stringify({
         type: "result",
         mode,
         result,
-        by: this.names.get(clientId) || "Guest",
+        by: client.name,
         ts: Date.now(),
-      };
-
-      this.lastResult = payload;
-      this.broadcast(payload);
+      });
+      this.broadcast(this.lastResultMessage);
       return;
     }
   }
 
   disconnect(clientId) {
-    const socket = this.clients.get(clientId);
-    if (socket) {
+    this.removeClients([clientId]);
+  }
+
+  // Drops a batch of clients and announces the new users list once, rather
+  // than rebroadcasting to the whole room for each removed client.
+  removeClients(clientIds) {
+    let removed = false;
+    for (const clientId of clientIds) {
+      const client = this.clients.get(clientId);
+      if (!client) continue; // close and error can both fire for one socket
       try {
-        socket.close();
+        client.socket.close();
       } catch {
         // ignore
       }
+      this.clients.delete(clientId);
+      removed = true;
     }
-    this.clients.delete(clientId);
-    this.names.delete(clientId);
-    this.broadcastUsers();
+    if (removed) this.broadcastUsers();
   }
 
   broadcastUsers() {
-    const users = Array.from(this.names.values());
-    this.broadcast({ type: "users", users });
+    const users = Array.from(this.clients.values(), (c) => c.name);
+    this.broadcast(JSON.stringify({ type: "users", users }));
   }
 
   broadcastList() {
-    this.broadcast({
+    this.listMessage = JSON.stringify({
       type: "list_state",
       items: this.listItems,
       drawn: this.withReplacement ? [] : this.drawnHistory,
       withReplacement: this.withReplacement,
     });
+    this.broadcast(this.listMessage);
   }
 
-  broadcast(payload) {
+  // Takes an already-serialized message so callers can reuse the string.
+  broadcast(message) {
     const dead = [];
-    const message = JSON.stringify(payload);
-    for (const [id, ws] of this.clients.entries()) {
+    for (const [id, { socket }] of this.clients) {
       try {
-        ws.send(message);
+        socket.send(message);
       } catch {
         dead.push(id);
       }
     }
-    dead.forEach((id) => this.disconnect(id));
+    if (dead.length) this.removeClients(dead);
   }
 }
 
 // Helpers
+
+// idFromName hashes the name on every call; reconnect storms hit the same
+// rooms, so keep a small per-isolate cache of ids (oldest evicted first).
+const ROOM_ID_CACHE_MAX = 1000;
+const roomIds = new Map();
+
+const roomObjectId = (env, roomId) => {
+  let id = roomIds.get(roomId);
+  if (!id) {
+    if (roomIds.size >= ROOM_ID_CACHE_MAX) {
+      roomIds.delete(roomIds.keys().next().value);
+    }
+    id = env.ROOM_DO.idFromName(roomId);
+    roomIds.set(roomId, id);
+  }
+  return id;
+};
 const sanitizeName = (name) => {
   if (!name || typeof name !== "string") return "Guest";
   const trimmed = name.trim();
@@ -289,6 +311,29 @@ const shortId = () => {
   return (buf[0].toString(36) + buf[1].toString(36)).slice(0, 8);
 };
 
+// Draws are served from a pooled crypto buffer: one getRandomValues call
+// covers many draws instead of a PRNG call per draw.
+const randomPool = new Uint32Array(256);
+let randomPoolIdx = randomPool.length;
+
+const randomUint32 = () => {
+  if (randomPoolIdx === randomPool.length) {
+    crypto.getRandomValues(randomPool);
+    randomPoolIdx = 0;
+  }
+  return randomPool[randomPoolIdx++];
+};
+
+// Uniform integer in [0, n); rejection sampling avoids modulo bias.
+const randomInt = (n) => {
+  const limit = 0x100000000 - (0x100000000 % n);
+  let x;
+  do {
+    x = randomUint32();
+  } while (x >= limit);
+  return x % n;
+};
+
 const sanitizeListPayload = (msg) => {
   const rawItems = Array.isArray(msg.items) ? msg.items : [];
   const trimmed = rawItems
@@ -305,14 +350,35 @@ const json = (obj) =>
     headers: { "content-type": "application/json" },
   });
 
-const html = (body) =>
-  new Response(body, {
-    status: 200,
-    headers: { "content-type": "text/html; charset=utf-8" },
+// Static bodies (pages are shells; the room id is read client-side) are
+// cached by browsers/CDN and revalidated with a content hash.
+const asset = (body) => ({ body, etag: `"${fnv1a(body)}"` });
+
+const cached = (request, { body, etag }, headers) => {
+  headers = { ...headers, etag };
+  if (request.headers.get("If-None-Match") === etag) {
+    return new Response(null, { status: 304, headers });
+  }
+  return new Response(body, { status: 200, headers });
+};
+
+const html = (request, page) =>
+  cached(request, page, {
+    "content-type": "text/html; charset=utf-8",
+    "cache-control": "public, max-age=3600",
   });
 
+const fnv1a = (str) => {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < str.length; i++) {
+    hash ^= str.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0).toString(16);
+};
+
 // Single-page HTML for landing + room.
-const renderApp = (roomId) => /* html */ `<!doctype html>
+const renderApp = (inRoom) => /* html */ `<!doctype html>
 <html lang="en">
 <head>
   <meta charset="UTF-8" />
@@ -801,7 +867,7 @@ const renderApp = (roomId) => /* html */ `<!doctype html>
       </div>
     </div>
 
-    <div class="card" id="landing" style="display:${roomId ? "none" : "block"}">
+    <div class="card" id="landing" style="display:${inRoom ? "none" : "block"}">
       <h2>Get Started</h2>
       <div class="grid">
         <div class="panel">
@@ -829,7 +895,7 @@ const renderApp = (roomId) => /* html */ `<!doctype html>
       </div>
     </div>
 
-    <div class="card" id="room" style="display:${roomId ? "block" : "none"}">
+    <div class="card" id="room" style="display:${inRoom ? "block" : "none"}">
       <!-- Main Content Area -->
       <div class="room-layout">
         <div class="stack">
@@ -913,7 +979,7 @@ const renderApp = (roomId) => /* html */ `<!doctype html>
 
   <script>
     const state = {
-      roomId: "${roomId}",
+      roomId: location.pathname.match(/^\\/room\\/([A-Za-z0-9-]+)$/)?.[1] || "",
       ws: null,
       listReady: false,
       listCounts: { items: 0, drawn: 0, withReplacement: true },
@@ -1103,3 +1169,8 @@ const renderApp = (roomId) => /* html */ `<!doctype html>
   </script>
 </body>
 </html>`;
+
+// Neither page has per-request inputs, so render them once per isolate.
+const landingPage = asset(renderApp(false));
+const roomPage = asset(renderApp(true));
+const favicon = asset(faviconSvg);